@@ -1,7 +1,35 @@
-from importlib.metadata import version as _metadata_version
+import typing as _typing
 
-from .async_client import AsyncCloudKV
-from .sync_client import SyncCloudKV
+if _typing.TYPE_CHECKING:
+    from .async_client import AsyncCloudKV
+    from .sync_client import SyncCloudKV
+
+    __version__: str
 
 __all__ = '__version__', 'SyncCloudKV', 'AsyncCloudKV'
-__version__ = _metadata_version('cloudkv')
+_SUBMODULES = frozenset({'async_client', 'shared', 'sync_client'})
+
+
+def __getattr__(name: str) -> _typing.Any:
+    # the clients (and so httpx and pydantic) and the version are imported lazily to keep the CLI fast to start
+    if name == 'AsyncCloudKV':
+        from .async_client import AsyncCloudKV as value
+    elif name == 'SyncCloudKV':
+        from .sync_client import SyncCloudKV as value
+    elif name == '__version__':
+        from importlib.metadata import version as _metadata_version
+
+        value = _metadata_version('cloudkv')
+    elif name in _SUBMODULES:
+        import importlib
+
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    # include the lazily imported names, which aren't in `globals()` until they're first used
+    return sorted({*globals(), *__all__})
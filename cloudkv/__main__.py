@@ -3,7 +3,8 @@ from __future__ import annotations
 import argparse
 import sys
 
-from cloudkv import SyncCloudKV, __version__, shared
+from cloudkv import __version__
+from cloudkv._constants import DEFAULT_BASE_URL
 
 
 def cli() -> int:
@@ -22,8 +23,8 @@ See https://github.com/samuelcolvin/cloudkv for more details.
         '-u',
         '--base-url',
         nargs='?',
-        help=f'CloudKV Base URL, defaults to {shared.DEFAULT_BASE_URL}.',
-        default=shared.DEFAULT_BASE_URL,
+        help=f'CloudKV Base URL, defaults to {DEFAULT_BASE_URL}.',
+        default=DEFAULT_BASE_URL,
     )
     parser.add_argument('--version', action='store_true', help='Show version and exit')
     args = parser.parse_args()
@@ -31,6 +32,8 @@ See https://github.com/samuelcolvin/cloudkv for more details.
         print(__version__)
         return 0
 
+    from cloudkv import SyncCloudKV
+
     print('creating namespace...')
     ns = SyncCloudKV.create_namespace(base_url=args.base_url)
 
@@ -40,7 +43,7 @@ Namespace created successfully.
 cloudkv_read_token = {ns.read_token!r}
 cloudkv_write_token = {ns.write_token!r}\
 """)
-    if args.base_url != shared.DEFAULT_BASE_URL:
+    if args.base_url != DEFAULT_BASE_URL:
         print(f'cloudkv_base_url = {args.base_url!r}')
     return 0
 
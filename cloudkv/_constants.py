@@ -0,0 +1,4 @@
+import os
+
+DEFAULT_BASE_URL = os.getenv('CLOUDKV_BASE_URL', 'https://cloudkv.samuelcolvin.workers.dev')
+PYDANTIC_CONTENT_TYPE = 'application/json; pydantic'
@@ -1,35 +1,255 @@
 from __future__ import annotations as _annotations
 
+import asyncio
+import atexit
+import functools
+import os
+import threading
 import typing
+import weakref
+from datetime import datetime, timedelta
 
+import httpx
+import msgspec
 import pydantic
+import pydantic_core
 
-from .shared import PYDANTIC_CONTENT_TYPE
+from .shared import PYDANTIC_CONTENT_TYPE, CreateNamespaceDetails, KeyInfo
+
+if typing.TYPE_CHECKING:
+    import aiohttp
+
+try:
+    from httpx_aiohttp import AiohttpTransport
+except ImportError:  # pragma: no cover
+    AiohttpTransport = None
 
 T = typing.TypeVar('T')
 D = typing.TypeVar('D')
-ta_lookup: dict[str, pydantic.TypeAdapter[typing.Any]] = {}
+MAX_CONNECTIONS = 100
+KEEPALIVE_EXPIRY = 30.0
+HTTP_LIMITS = httpx.Limits(
+    max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS, keepalive_expiry=KEEPALIVE_EXPIRY
+)
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+_use_aiohttp = False
+_shared_sync_client: httpx.Client | None = None
+_shared_sync_client_lock = threading.Lock()
+_shared_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, typing.AsyncGenerator[None, None]]
+] = weakref.WeakKeyDictionary()
 
 
-def cached_type_adapter(return_type: type[T]) -> pydantic.TypeAdapter[T]:
-    key = return_type.__qualname__
-    if ta := ta_lookup.get(key):
-        return ta
+def new_sync_client() -> httpx.Client:
+    return httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+def enable_aiohttp() -> bool:
+    """Use aiohttp as the transport for async clients created from now on, if `httpx-aiohttp` is installed."""
+    global _use_aiohttp
+    _use_aiohttp = AiohttpTransport is not None
+    return _use_aiohttp
+
+
+def new_async_client() -> httpx.AsyncClient:
+    """Create an async client, using aiohttp as the transport if it's been enabled with `enable_aiohttp()`."""
+    if _use_aiohttp and AiohttpTransport is not None:
+        transport = AiohttpTransport(client=_aiohttp_session)
+        return httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
     else:
-        ta_lookup[key] = ta = pydantic.TypeAdapter(return_type)
-        return ta
+        return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+def _aiohttp_session() -> aiohttp.ClientSession:
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, keepalive_timeout=KEEPALIVE_EXPIRY)
+    # without `skip_auto_headers` aiohttp sets `Content-Type: application/octet-stream` on values set without a
+    # content type, `trust_env` means proxy environment variables and netrc are respected, as they are by httpx
+    return aiohttp.ClientSession(connector=connector, skip_auto_headers=('Content-Type',), trust_env=True)
+
+
+def shared_sync_client() -> httpx.Client:
+    """Lazily create a process-wide sync client, this is closed when the interpreter exits.
+
+    Creation is thread-safe, and a forked child process creates its own client rather than using its parent's.
+    """
+    global _shared_sync_client
+    client = _shared_sync_client
+    if client is None:
+        with _shared_sync_client_lock:
+            client = _shared_sync_client
+            if client is None:
+                client = _shared_sync_client = new_sync_client()
+    return client
+
+
+def _close_shared_sync_client() -> None:
+    if _shared_sync_client is not None:
+        _shared_sync_client.close()
+
+
+atexit.register(_close_shared_sync_client)
+
+
+def _reset_after_fork() -> None:  # pragma: no cover
+    # a forked child shares the parent's connections so needs its own client, the inherited client isn't closed
+    # since that would talk over the parent's connections, the lock is replaced in case another thread held it
+    global _shared_sync_client, _shared_sync_client_lock
+    _shared_sync_client = None
+    _shared_sync_client_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def shared_async_client() -> httpx.AsyncClient:
+    """Lazily create an async client shared by everything running on the current asyncio event loop.
+
+    Connection pools are bound to the loop they were created on, so each loop gets its own client, this is closed
+    when the loop shuts down its async generators, e.g. at the end of `asyncio.run()`.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        raise RuntimeError(
+            'AsyncCloudKV must be used as an async context manager, or given client=, when not running on asyncio'
+        ) from None
+    entry = _shared_async_clients.get(loop)
+    if entry is not None:
+        if not entry[0].is_closed:
+            return entry[0]
+        # the client has been closed elsewhere, finish its closer now, so the closer isn't garbage collected and
+        # closed later by the loop
+        try:
+            entry[1].aclose().send(None)
+        except StopIteration:
+            pass
+
+    # a client's connections reference its loop, so entries for loops closed without shutting down their async
+    # generators wouldn't be dropped by the `WeakKeyDictionary`, instead they're removed here
+    for closed_loop in [other_loop for other_loop in _shared_async_clients if other_loop.is_closed()]:
+        del _shared_async_clients[closed_loop]
+
+    client = new_async_client()
+    closer = _close_at_shutdown(client)
+    # starting the generator registers it with the loop, which closes it in `loop.shutdown_asyncgens()`
+    try:
+        closer.asend(None).send(None)
+    except StopIteration:
+        pass
+    # the loop only holds a weak reference to the generator, so we keep it here
+    _shared_async_clients[loop] = client, closer
+    return client
+
+
+async def _close_at_shutdown(client: httpx.AsyncClient) -> typing.AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        # the entry may already have been replaced by a new client
+        loop = asyncio.get_running_loop()
+        entry = _shared_async_clients.get(loop)
+        if entry is not None and entry[0] is client:
+            del _shared_async_clients[loop]
+        if not client.is_closed:
+            await client.aclose()
+
+
+def asyncio_running() -> bool:
+    """Whether we're running in an asyncio task, rather than on another async library like trio."""
+    try:
+        return asyncio.current_task() is not None
+    except RuntimeError:
+        # no running event loop
+        return False
+
+
+_type_adapter_cache = functools.lru_cache(maxsize=256)(pydantic.TypeAdapter)
+
+
+def cached_type_adapter(return_type: type[T]) -> pydantic.TypeAdapter[T]:
+    try:
+        return _type_adapter_cache(return_type)
+    except TypeError:
+        # unhashable type, e.g. `Annotated` with unhashable metadata, these aren't cached since the alternative of
+        # keying on `repr()` could conflate distinct types
+        return pydantic.TypeAdapter(return_type)
+
+
+class _CreateNamespaceStruct(msgspec.Struct):
+    base_url: str
+    read_token: str
+    write_token: str
+    created_at: datetime
+
+
+class _KeyInfoStruct(msgspec.Struct):
+    url: str
+    key: str
+    content_type: typing.Optional[str]  # noqa: UP007 msgspec evaluates annotations at runtime, even on 3.9
+    size: int
+    created_at: datetime
+    expiration: datetime
+
+
+class _KeysResponseStruct(msgspec.Struct):
+    keys: list[_KeyInfoStruct]
+
+
+_create_namespace_decoder = msgspec.json.Decoder(_CreateNamespaceStruct)
+_key_info_decoder = msgspec.json.Decoder(_KeyInfoStruct)
+_keys_decoder = msgspec.json.Decoder(_KeysResponseStruct)
+
+# Responses from the server are decoded and validated with msgspec which is far faster than pydantic (and means
+# pydantic doesn't have to build schemas for these models), the public models are then built without revalidation.
+
+
+def decode_create_namespace(content: bytes) -> CreateNamespaceDetails:
+    details = _create_namespace_decoder.decode(content)
+    return CreateNamespaceDetails.model_construct(**msgspec.structs.asdict(details))
+
+
+def decode_key_info(content: bytes) -> KeyInfo:
+    return KeyInfo.model_construct(**msgspec.structs.asdict(_key_info_decoder.decode(content)))
+
+
+def decode_keys(content: bytes) -> list[KeyInfo]:
+    response = _keys_decoder.decode(content)
+    return [KeyInfo.model_construct(**msgspec.structs.asdict(k)) for k in response.keys]
+
+
+# a tuple rather than a set since `return_type` may be unhashable
+_JSON_TYPES: tuple[type[typing.Any], ...] = (dict, list, int, float, bool, type(None))
 
 
 def encode_value(value: typing.Any) -> tuple[bytes, str | None]:
-    if isinstance(value, str):
-        return value.encode('utf-8'), 'text/plain'
-    elif isinstance(value, bytes):
-        return value, None
-    elif isinstance(value, bytearray):
-        return bytes(value), None
-    else:
-        value_type: type[typing.Any] = type(value)
-        return cached_type_adapter(value_type).dump_json(value), PYDANTIC_CONTENT_TYPE
+    value_type: type[typing.Any] = type(value)
+    encoder = _ENCODERS.get(value_type)
+    if encoder is not None:
+        return encoder(value)
+    # subclasses, e.g. `str` enums, are encoded like their base type
+    for base_type in str, bytes, bytearray:
+        if isinstance(value, base_type):
+            return _ENCODERS[base_type](value)
+    return cached_type_adapter(value_type).dump_json(value), PYDANTIC_CONTENT_TYPE
+
+
+def _encode_json(value: typing.Any) -> tuple[bytes, str | None]:
+    # no TypeAdapter needed, the output is identical to `TypeAdapter(type(value)).dump_json(value)`
+    return pydantic_core.to_json(value, inf_nan_mode='null'), PYDANTIC_CONTENT_TYPE
+
+
+# keyed on the exact type of the value, httpx only sends `bytes` as-is, other buffers would be iterated over,
+# so we have to copy them
+_ENCODERS: dict[type[typing.Any], typing.Callable[[typing.Any], tuple[bytes, str | None]]] = {
+    str: lambda value: (value.encode('utf-8'), 'text/plain'),
+    bytes: lambda value: (value, None),
+    bytearray: lambda value: (bytes(value), None),
+    memoryview: lambda value: (value.tobytes(), None),
+    **dict.fromkeys(_JSON_TYPES, _encode_json),
+}
 
 
 def decode_value(
@@ -38,15 +258,36 @@ def decode_value(
     if data is None:
         return default
     elif force_validate or content_type == PYDANTIC_CONTENT_TYPE:
+        if return_type in _JSON_TYPES:
+            # if the parsed JSON already has the right type there's nothing to validate, otherwise (e.g. `1` when
+            # `float` is requested, or invalid JSON) the TypeAdapter coerces the value or raises a `ValidationError`
+            try:
+                value = pydantic_core.from_json(data)
+            except ValueError:
+                pass
+            else:
+                if type(value) is return_type:
+                    return value
         return cached_type_adapter(return_type).validate_json(data)
-    elif return_type is bytes:
-        return typing.cast(T, data)
-    elif return_type is str:
-        return typing.cast(T, data.decode())
-    elif return_type is bytearray:
-        return typing.cast(T, bytearray(data))
-    else:
+
+    decoder = _DECODERS.get(id(return_type))
+    if decoder is None:
         raise RuntimeError(f'Content-Type was not {PYDANTIC_CONTENT_TYPE!r} and return_type was not a string type')
+    return decoder(data)
+
+
+# keyed on `id()` since `return_type` may be unhashable
+_DECODERS: dict[int, typing.Callable[[bytes], typing.Any]] = {
+    id(bytes): lambda data: data,
+    id(str): bytes.decode,
+    id(bytearray): bytearray,
+}
+
+
+@functools.lru_cache(maxsize=64)
+def expires_header(expires: int | timedelta) -> str:
+    """Convert `expires` to a header value, cached since applications tend to use a few fixed expiry times."""
+    return str(expires if isinstance(expires, int) else int(expires.total_seconds()))
 
 
 def keys_query_params(
@@ -66,5 +307,8 @@ def keys_query_params(
     return params
 
 
+_LIKE_ESCAPE = str.maketrans({'%': '\\%', '_': '\\_'})
+
+
 def _escape_like_pattern(pattern: str) -> str:
-    return pattern.replace('%', '\\%').replace('_', '\\_')
+    return pattern.translate(_LIKE_ESCAPE)
@@ -1,5 +1,6 @@
 from __future__ import annotations as _annotations
 
+import asyncio as _asyncio
 import typing as _typing
 from datetime import timedelta
 
@@ -15,18 +16,39 @@ D = _typing.TypeVar('D')
 class AsyncCloudKV:
     """Async client for cloudkv.
 
-    This client must be used as an async context manager to create a database connection.
+    On asyncio this client can be used either directly after initialization or as an async context manager, either
+    way connections are pooled in a client shared by all instances on the same event loop, within `async with` this
+    client is looked up once rather than on every request. On other async libraries
+    like trio it must be used as an async context manager, or be given a client.
     """
 
+    __slots__ = (
+        'namespace_read_token',
+        'namespace_write_token',
+        'base_url',
+        '_client',
+        '_context_client',
+        '_context_depth',
+        '_ns_url',
+        '_key_prefix',
+        '_auth_headers',
+    )
+
     namespace_read_token: str
     """Key used to get values and list keys."""
     namespace_write_token: str | None
     """Key required to set and delete keys."""
     base_url: str
     """Base URL to connect to."""
-    _client: _httpx.AsyncClient | None = None
 
-    def __init__(self, read_token: str, write_token: str | None, *, base_url: str = _shared.DEFAULT_BASE_URL):
+    def __init__(
+        self,
+        read_token: str,
+        write_token: str | None,
+        *,
+        base_url: str = _shared.DEFAULT_BASE_URL,
+        client: _httpx.AsyncClient | None = None,
+    ):
         """Initialize a new async client.
 
         Args:
@@ -34,12 +56,18 @@ class AsyncCloudKV:
             write_token: Write API key for the namespace, maybe unset if you only have permission to read values
                 and list keys.
             base_url: Base URL to connect to.
+            client: HTTP client to use, this is never closed by `AsyncCloudKV`. By default a client shared by all
+                instances on the current event loop is used.
         """
         self.namespace_read_token = read_token
         self.namespace_write_token = write_token
-        while base_url.endswith('/'):
-            base_url = base_url[:-1]
-        self.base_url = base_url
+        self.base_url = base_url.rstrip('/')
+        self._ns_url = f'{self.base_url}/{read_token}'
+        self._key_prefix = f'{self._ns_url}/'
+        self._auth_headers: dict[str, str] = {'authorization': write_token} if write_token else {}
+        self._client = client
+        self._context_client: _httpx.AsyncClient | None = None
+        self._context_depth = 0
 
     @classmethod
     async def create_namespace(cls, *, base_url: str = _shared.DEFAULT_BASE_URL) -> _shared.CreateNamespaceDetails:
@@ -51,19 +79,77 @@ class AsyncCloudKV:
         Returns:
             `CreateNamespaceDetails` instance with details of the namespace.
         """
-        async with _httpx.AsyncClient() as client:
-            response = await client.post(f'{base_url}/create')
-            _shared.ResponseError.check(response)
-            return _shared.CreateNamespaceDetails.model_validate_json(response.content)
+        if _utils.asyncio_running():
+            response = await _utils.shared_async_client().post(f'{base_url}/create')
+        else:
+            async with _utils.new_async_client() as client:
+                response = await client.post(f'{base_url}/create')
+        _shared.ResponseError.check(response)
+        return _utils.decode_create_namespace(response.content)
+
+    @staticmethod
+    def install_uvloop() -> bool:
+        """Use [uvloop](https://github.com/MagicStack/uvloop) for new event loops if it's installed.
+
+        This should be called before the event loop is started, e.g. before `asyncio.run()`.
+
+        This works by setting the global event loop policy, which is deprecated from Python 3.14. On Python 3.12 and
+        later, prefer starting the loop with `uvloop.run(main())` or
+        `asyncio.Runner(loop_factory=uvloop.new_event_loop)`, which don't change global state.
+
+        Returns:
+            `True` if uvloop was installed, `False` if it isn't available.
+        """
+        try:
+            import uvloop
+        except ImportError:
+            return False
+        else:
+            # equivalent to `uvloop.install()`, which is deprecated from python 3.12, note that
+            # `set_event_loop_policy` itself is deprecated from python 3.14
+            _asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            return True
+
+    @staticmethod
+    def install_aiohttp() -> bool:
+        """Use [aiohttp](https://docs.aiohttp.org) for connections if
+        [httpx-aiohttp](https://github.com/karpetrosyan/httpx-aiohttp) is installed.
+
+        aiohttp can give higher throughput when making many concurrent requests, but it only supports HTTP/1.1 and
+        asyncio. This applies to HTTP clients `AsyncCloudKV` creates after it's called, not to clients passed to
+        `__init__`.
+
+        Returns:
+            `True` if aiohttp will be used, `False` if httpx-aiohttp isn't available.
+        """
+        return _utils.enable_aiohttp()
+
+    @property
+    def client(self) -> _httpx.AsyncClient:
+        """HTTP client used to make requests."""
+        return self._client or _utils.shared_async_client()
 
     async def __aenter__(self):
-        self._client = _httpx.AsyncClient()
-        await self._client.__aenter__()
+        if self._client is None:
+            # the client is resolved once for the whole block rather than on every request, shared clients are per
+            # asyncio event loop, on other async libraries (e.g. trio) we use a client for just this block
+            if _utils.asyncio_running():
+                self._client = self._context_client = _utils.shared_async_client()
+            else:
+                self._client = self._context_client = _utils.new_async_client()
+        if self._context_client is not None:
+            self._context_depth += 1
         return self
 
     async def __aexit__(self, *args: _typing.Any):
-        assert self._client is not None
-        await self._client.__aexit__(*args)
+        if self._context_client is not None:
+            self._context_depth -= 1
+            if self._context_depth == 0:
+                client = self._context_client
+                self._client = self._context_client = None
+                # the shared client is kept open for reuse and closed along with the event loop
+                if not _utils.asyncio_running():
+                    await client.aclose()
 
     async def get(self, key: str) -> bytes | None:
         """Get a value from its key.
@@ -74,8 +160,8 @@ class AsyncCloudKV:
         Returns:
             Value as bytes, or `None` if the key does not exist.
         """
-        value, _ = await self.get_content_type(key)
-        return value
+        response = await self._get(key)
+        return None if response is None else response.content
 
     async def get_content_type(self, key: str) -> tuple[bytes | None, str | None]:
         """Get a value and content-type from a key.
@@ -87,14 +173,56 @@ class AsyncCloudKV:
             Value as tuple of `(value, content_type)`, value will be `None` if the key does not exist,
             `content_type` will be `None` if the key doesn't exist, or no content-type is set on the key.
         """
-        assert key, 'Key cannot be empty'
-        response = await self.client.get(f'{self.base_url}/{self.namespace_read_token}/{key}')
-        _shared.ResponseError.check(response)
-        if response.status_code == 244:
+        response = await self._get(key)
+        if response is None:
             return None, None
         else:
             return response.content, response.headers.get('Content-Type')
 
+    async def get_many(self, keys: _typing.Sequence[str], *, concurrency: int = 32) -> dict[str, bytes | None]:
+        """Get many values concurrently.
+
+        Requests share the client's connection pool, so with HTTP/2 they're multiplexed over a single connection.
+
+        Args:
+            keys: keys to lookup
+            concurrency: maximum number of requests to make at once
+
+        Returns:
+            Dict mapping keys to values, values are `None` if the key does not exist.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        semaphore = _asyncio.Semaphore(concurrency)
+
+        async def get(key: str) -> bytes | None:
+            async with semaphore:
+                return await self.get(key)
+
+        values = await _asyncio.gather(*(get(key) for key in keys))
+        return dict(zip(keys, values))
+
+    async def get_stream(self, key: str, *, chunk_size: int = 64 * 1024) -> _typing.AsyncIterator[bytes]:
+        """Stream a value in chunks, rather than reading the whole value into memory at once.
+
+        Args:
+            key: key to lookup
+            chunk_size: maximum size of each chunk in bytes
+
+        Yields:
+            Chunks of the value, nothing is yielded if the key does not exist.
+        """
+        if not key:
+            raise ValueError('Key cannot be empty')
+        client = self._client or _utils.shared_async_client()
+        async with client.stream('GET', self._key_prefix + key) as response:
+            if not response.is_success:
+                await response.aread()
+            _shared.ResponseError.check(response)
+            if response.status_code != 244:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+
     async def get_as(self, key: str, return_type: type[T], *, default: D = None, force_validate: bool = False) -> T | D:
         """Get a value as the given type, or fallback to the `default` value if the value does not exist.
 
@@ -111,8 +239,11 @@ class AsyncCloudKV:
         Returns:
             The value as the given type, or the default value if the key does not exist.
         """
-        data, content_type = await self.get_content_type(key)
-        return _utils.decode_value(data, content_type, return_type, default, force_validate)
+        response = await self._get(key)
+        if response is None:
+            return default
+        content_type = response.headers.get('Content-Type')
+        return _utils.decode_value(response.content, content_type, return_type, default, force_validate)
 
     async def set(
         self,
@@ -137,6 +268,36 @@ class AsyncCloudKV:
         set_response = await self.set_details(key, value, content_type=content_type, expires=expires)
         return set_response.url
 
+    async def set_many(
+        self,
+        items: _typing.Mapping[str, _typing.Any],
+        *,
+        expires: int | timedelta | None = None,
+        concurrency: int = 32,
+    ) -> dict[str, str]:
+        """Set many values concurrently.
+
+        Requests share the client's connection pool, so with HTTP/2 they're multiplexed over a single connection.
+
+        Args:
+            items: mapping of keys to values to set, content types are inferred from each value
+            expires: Time in seconds before the values expire, see `set` for details.
+            concurrency: maximum number of requests to make at once
+
+        Returns:
+            Dict mapping keys to the URL of each set operation.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        semaphore = _asyncio.Semaphore(concurrency)
+
+        async def set_(key: str, value: _typing.Any) -> str:
+            async with semaphore:
+                return await self.set(key, value, expires=expires)
+
+        urls = await _asyncio.gather(*(set_(key, value) for key, value in items.items()))
+        return dict(zip(items, urls))
+
     async def set_details(
         self,
         key: str,
@@ -163,17 +324,19 @@ class AsyncCloudKV:
         binary_value, inferred_content_type = _utils.encode_value(value)
         content_type = content_type or inferred_content_type
 
-        headers: dict[str, str] = {'authorization': self.namespace_write_token}
-        if content_type is not None:
-            headers['Content-Type'] = content_type
-        if expires is not None:
-            headers['Expires'] = str(expires if isinstance(expires, int) else int(expires.total_seconds()))
-
-        response = await self.client.post(
-            f'{self.base_url}/{self.namespace_read_token}/{key}', content=binary_value, headers=headers
-        )
+        if content_type is None and expires is None:
+            headers = self._auth_headers
+        else:
+            headers = self._auth_headers.copy()
+            if content_type is not None:
+                headers['Content-Type'] = content_type
+            if expires is not None:
+                headers['Expires'] = _utils.expires_header(expires)
+
+        client = self._client or _utils.shared_async_client()
+        response = await client.post(self._key_prefix + key, content=binary_value, headers=headers)
         _shared.ResponseError.check(response)
-        return _shared.KeyInfo.model_validate_json(response.content)
+        return _utils.decode_key_info(response.content)
 
     async def delete(self, key: str) -> bool:
         """Delete a key.
@@ -186,8 +349,8 @@ class AsyncCloudKV:
         """
         if not self.namespace_write_token:
             raise RuntimeError("Namespace write key not provided, can't delete")
-        headers: dict[str, str] = {'authorization': self.namespace_write_token}
-        response = await self.client.delete(f'{self.base_url}/{self.namespace_read_token}/{key}', headers=headers)
+        client = self._client or _utils.shared_async_client()
+        response = await client.delete(self._key_prefix + key, headers=self._auth_headers)
         _shared.ResponseError.check(response)
         return response.status_code == 200
 
@@ -228,13 +391,18 @@ class AsyncCloudKV:
         """
         params = _utils.keys_query_params(starts_with, ends_with, contains, like, offset)
 
-        response = await self.client.get(f'{self.base_url}/{self.namespace_read_token}', params=params)
+        client = self._client or _utils.shared_async_client()
+        response = await client.get(self._ns_url, params=params)
         _shared.ResponseError.check(response)
-        return _shared.KeysResponse.model_validate_json(response.content).keys
+        return _utils.decode_keys(response.content)
 
-    @property
-    def client(self) -> _httpx.AsyncClient:
-        if self._client:
-            return self._client
+    async def _get(self, key: str) -> _httpx.Response | None:
+        if not key:
+            raise ValueError('Key cannot be empty')
+        client = self._client or _utils.shared_async_client()
+        response = await client.get(self._key_prefix + key)
+        _shared.ResponseError.check(response)
+        if response.status_code == 244:
+            return None
         else:
-            raise RuntimeError('HTTP client not initialized - AsyncCloudKV must be used as an async context manager')
+            return response
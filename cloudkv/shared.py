@@ -1,12 +1,13 @@
 from __future__ import annotations as _annotations
 
-import os
 import typing
 from datetime import datetime
 
 import httpx
 import pydantic
 
+from ._constants import DEFAULT_BASE_URL, PYDANTIC_CONTENT_TYPE
+
 if typing.TYPE_CHECKING:
     from . import AsyncCloudKV, SyncCloudKV
 
@@ -18,11 +19,11 @@ __all__ = (
     'KeysResponse',
     'ResponseError',
 )
-DEFAULT_BASE_URL = os.getenv('CLOUDKV_BASE_URL', 'https://cloudkv.samuelcolvin.workers.dev')
-PYDANTIC_CONTENT_TYPE = 'application/json; pydantic'
 
 
 class CreateNamespaceDetails(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(defer_build=True)
+
     base_url: str
     """Base URL of the namespace"""
     read_token: str
@@ -32,18 +33,20 @@ class CreateNamespaceDetails(pydantic.BaseModel):
     created_at: datetime
     """Creation timestamp of the namespace"""
 
-    def sync_client(self) -> SyncCloudKV:
+    def sync_client(self, *, client: httpx.Client | None = None) -> SyncCloudKV:
         from .sync_client import SyncCloudKV
 
-        return SyncCloudKV(self.read_token, self.write_token, base_url=self.base_url)
+        return SyncCloudKV(self.read_token, self.write_token, base_url=self.base_url, client=client)
 
-    def async_client(self) -> AsyncCloudKV:
+    def async_client(self, *, client: httpx.AsyncClient | None = None) -> AsyncCloudKV:
         from .async_client import AsyncCloudKV
 
-        return AsyncCloudKV(self.read_token, self.write_token, base_url=self.base_url)
+        return AsyncCloudKV(self.read_token, self.write_token, base_url=self.base_url, client=client)
 
 
 class KeyInfo(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(defer_build=True)
+
     url: str
     """URL of the key/value"""
     key: str
@@ -59,11 +62,14 @@ class KeyInfo(pydantic.BaseModel):
 
 
 class KeysResponse(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(defer_build=True)
+
     keys: list[KeyInfo]
 
 
 class ResponseError(ValueError):
     @classmethod
     def check(cls, response: httpx.Response) -> None:
-        if not response.is_success:
+        # compare directly rather than via `response.is_success`, which goes through a property and `codes.is_success`
+        if not 200 <= response.status_code < 300:
             raise cls(f'Unexpected {response.status_code} response: {response.text}')
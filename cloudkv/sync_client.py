@@ -1,6 +1,7 @@
 from __future__ import annotations as _annotations
 
 import typing as _typing
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 from datetime import timedelta
 
 import httpx as _httpx
@@ -15,18 +16,37 @@ D = _typing.TypeVar('D')
 class SyncCloudKV:
     """Sync client for cloudkv.
 
-    This client can be used either directly after initialization or as a context manager.
+    This client can be used either directly after initialization or as a context manager, either way connections are
+    pooled in a process-wide client shared by all instances.
     """
 
+    __slots__ = (
+        'namespace_read_token',
+        'namespace_write_token',
+        'base_url',
+        'client',
+        '_ns_url',
+        '_key_prefix',
+        '_auth_headers',
+    )
+
     namespace_read_token: str
     """Key used to get values and list keys."""
     namespace_write_token: str | None
     """Key required to set and delete keys."""
     base_url: str
     """Base URL to connect to."""
-    _client: _httpx.Client | None = None
+    client: _httpx.Client
+    """HTTP client used to make requests."""
 
-    def __init__(self, read_token: str, write_token: str | None, *, base_url: str = _shared.DEFAULT_BASE_URL):
+    def __init__(
+        self,
+        read_token: str,
+        write_token: str | None,
+        *,
+        base_url: str = _shared.DEFAULT_BASE_URL,
+        client: _httpx.Client | None = None,
+    ):
         """Initialize a new sync client.
 
         Args:
@@ -34,12 +54,16 @@ class SyncCloudKV:
             write_token: Write API key for the namespace, maybe unset if you only have permission to read values
                 and list keys.
             base_url: Base URL to connect to.
+            client: HTTP client to use, this is never closed by `SyncCloudKV`. By default a process-wide client
+                shared by all instances is used.
         """
         self.namespace_read_token = read_token
         self.namespace_write_token = write_token
-        while base_url.endswith('/'):
-            base_url = base_url[:-1]
-        self.base_url = base_url
+        self.base_url = base_url.rstrip('/')
+        self._ns_url = f'{self.base_url}/{read_token}'
+        self._key_prefix = f'{self._ns_url}/'
+        self._auth_headers: dict[str, str] = {'authorization': write_token} if write_token else {}
+        self.client = client if client is not None else _utils.shared_sync_client()
 
     @classmethod
     def create_namespace(cls, *, base_url: str = _shared.DEFAULT_BASE_URL) -> _shared.CreateNamespaceDetails:
@@ -51,18 +75,16 @@ class SyncCloudKV:
         Returns:
             `CreateNamespaceDetails` instance with details of the namespace.
         """
-        response = _httpx.post(f'{base_url}/create')
+        response = _utils.shared_sync_client().post(f'{base_url}/create')
         _shared.ResponseError.check(response)
-        return _shared.CreateNamespaceDetails.model_validate_json(response.content)
+        return _utils.decode_create_namespace(response.content)
 
     def __enter__(self):
-        self._client = _httpx.Client()
-        self._client.__enter__()
         return self
 
     def __exit__(self, *args: _typing.Any):
-        assert self._client is not None
-        self._client.__exit__(*args)
+        # the shared client is kept open for reuse and closed when the interpreter exits
+        pass
 
     def get(self, key: str) -> bytes | None:
         """Get a value from its key.
@@ -73,7 +95,8 @@ class SyncCloudKV:
         Returns:
             Value as bytes, or `None` if the key does not exist.
         """
-        return self.get_content_type(key)[0]
+        response = self._get(key)
+        return None if response is None else response.content
 
     def get_content_type(self, key: str) -> tuple[bytes | None, str | None]:
         """Get a value and content-type from a key.
@@ -85,14 +108,49 @@ class SyncCloudKV:
             Value as tuple of `(value, content_type)`, value will be `None` if the key does not exist,
             `content_type` will be `None` if the key doesn't exist, or no content-type is set on the key.
         """
-        assert key, 'Key cannot be empty'
-        response = self.client.get(f'{self.base_url}/{self.namespace_read_token}/{key}')
-        _shared.ResponseError.check(response)
-        if response.status_code == 244:
+        response = self._get(key)
+        if response is None:
             return None, None
         else:
             return response.content, response.headers.get('Content-Type')
 
+    def get_many(self, keys: _typing.Sequence[str], *, concurrency: int = 32) -> dict[str, bytes | None]:
+        """Get many values concurrently.
+
+        Requests are made from a pool of threads and share the client's connection pool.
+
+        Args:
+            keys: keys to lookup
+            concurrency: maximum number of requests to make at once
+
+        Returns:
+            Dict mapping keys to values, values are `None` if the key does not exist.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        with _ThreadPoolExecutor(max_workers=concurrency) as executor:
+            values = list(executor.map(self.get, keys))
+        return dict(zip(keys, values))
+
+    def get_stream(self, key: str, *, chunk_size: int = 64 * 1024) -> _typing.Iterator[bytes]:
+        """Stream a value in chunks, rather than reading the whole value into memory at once.
+
+        Args:
+            key: key to lookup
+            chunk_size: maximum size of each chunk in bytes
+
+        Yields:
+            Chunks of the value, nothing is yielded if the key does not exist.
+        """
+        if not key:
+            raise ValueError('Key cannot be empty')
+        with self.client.stream('GET', self._key_prefix + key) as response:
+            if not response.is_success:
+                response.read()
+            _shared.ResponseError.check(response)
+            if response.status_code != 244:
+                yield from response.iter_bytes(chunk_size)
+
     def get_as(self, key: str, return_type: type[T], *, default: D = None, force_validate: bool = False) -> T | D:
         """Get a value as the given type, or fallback to the `default` value if the value does not exist.
 
@@ -109,8 +167,11 @@ class SyncCloudKV:
         Returns:
             The value as the given type, or the default value if the key does not exist.
         """
-        data, content_type = self.get_content_type(key)
-        return _utils.decode_value(data, content_type, return_type, default, force_validate)
+        response = self._get(key)
+        if response is None:
+            return default
+        content_type = response.headers.get('Content-Type')
+        return _utils.decode_value(response.content, content_type, return_type, default, force_validate)
 
     def set(
         self,
@@ -134,6 +195,35 @@ class SyncCloudKV:
         """
         return self.set_details(key, value, content_type=content_type, expires=expires).url
 
+    def set_many(
+        self,
+        items: _typing.Mapping[str, _typing.Any],
+        *,
+        expires: int | timedelta | None = None,
+        concurrency: int = 32,
+    ) -> dict[str, str]:
+        """Set many values concurrently.
+
+        Requests are made from a pool of threads and share the client's connection pool.
+
+        Args:
+            items: mapping of keys to values to set, content types are inferred from each value
+            expires: Time in seconds before the values expire, see `set` for details.
+            concurrency: maximum number of requests to make at once
+
+        Returns:
+            Dict mapping keys to the URL of each set operation.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        def set_(key: str, value: _typing.Any) -> str:
+            return self.set(key, value, expires=expires)
+
+        with _ThreadPoolExecutor(max_workers=concurrency) as executor:
+            urls = list(executor.map(set_, items.keys(), items.values()))
+        return dict(zip(items, urls))
+
     def set_details(
         self,
         key: str,
@@ -160,18 +250,18 @@ class SyncCloudKV:
         binary_value, inferred_content_type = _utils.encode_value(value)
         content_type = content_type or inferred_content_type
 
-        headers: dict[str, str] = {'authorization': self.namespace_write_token}
-        if content_type is not None:
-            headers['Content-Type'] = content_type
-
-        if expires is not None:
-            headers['Expires'] = str(expires if isinstance(expires, int) else int(expires.total_seconds()))
+        if content_type is None and expires is None:
+            headers = self._auth_headers
+        else:
+            headers = self._auth_headers.copy()
+            if content_type is not None:
+                headers['Content-Type'] = content_type
+            if expires is not None:
+                headers['Expires'] = _utils.expires_header(expires)
 
-        response = self.client.post(
-            f'{self.base_url}/{self.namespace_read_token}/{key}', content=binary_value, headers=headers
-        )
+        response = self.client.post(self._key_prefix + key, content=binary_value, headers=headers)
         _shared.ResponseError.check(response)
-        return _shared.KeyInfo.model_validate_json(response.content)
+        return _utils.decode_key_info(response.content)
 
     def delete(self, key: str) -> bool:
         """Delete a key.
@@ -184,8 +274,7 @@ class SyncCloudKV:
         """
         if not self.namespace_write_token:
             raise RuntimeError("Namespace write key not provided, can't delete")
-        headers: dict[str, str] = {'authorization': self.namespace_write_token}
-        response = self.client.delete(f'{self.base_url}/{self.namespace_read_token}/{key}', headers=headers)
+        response = self.client.delete(self._key_prefix + key, headers=self._auth_headers)
         _shared.ResponseError.check(response)
         return response.status_code == 200
 
@@ -226,14 +315,16 @@ class SyncCloudKV:
         """
         params = _utils.keys_query_params(starts_with, ends_with, contains, like, offset)
 
-        response = self.client.get(f'{self.base_url}/{self.namespace_read_token}', params=params)
+        response = self.client.get(self._ns_url, params=params)
         _shared.ResponseError.check(response)
-        return _shared.KeysResponse.model_validate_json(response.content).keys
+        return _utils.decode_keys(response.content)
 
-    @property
-    def client(self) -> _httpx.Client:
-        if self._client:
-            return self._client
+    def _get(self, key: str) -> _httpx.Response | None:
+        if not key:
+            raise ValueError('Key cannot be empty')
+        response = self.client.get(self._key_prefix + key)
+        _shared.ResponseError.check(response)
+        if response.status_code == 244:
+            return None
         else:
-            # this is a typing lie, but one that works niceli
-            return _httpx  # pyright: ignore[reportReturnType]
+            return response
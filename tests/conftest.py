@@ -1,28 +1,33 @@
 import os
+import signal
 import subprocess
-import tempfile
 import time
+import uuid
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Iterable
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator
 
 import httpx
 import pytest
 
+from cloudkv import SyncCloudKV, _utils, shared
+
 if TYPE_CHECKING:
 
     def IsDatetime(*args: Any, **kwargs: Any) -> datetime: ...
     def IsFloat(*args: Any, **kwargs: Any) -> float: ...
     def IsInt(*args: Any, **kwargs: Any) -> int: ...
-    def IsNow(*args: Any, **kwargs: Any) -> datetime: ...
+    def IsNow() -> datetime: ...
     def IsStr(*args: Any, **kwargs: Any) -> str: ...
 else:
     from dirty_equals import IsDatetime, IsFloat, IsInt, IsNow as _IsNow, IsStr
 
-    def IsNow(*args: Any, **kwargs: Any):
-        kwargs.setdefault('delta', 10)
-        kwargs.setdefault('tz', timezone.utc)
-        return _IsNow(*args, **kwargs)
+    # `IsNow` refreshes "now" on every comparison, so one matcher can be built once and shared by all tests
+    _is_now = _IsNow(delta=10, tz=timezone.utc)
+
+    def IsNow():
+        return _is_now
 
 
 @pytest.fixture(scope='session')
@@ -36,50 +41,114 @@ def server() -> Iterable[str]:
     if remove_url := os.getenv('TEST_AGAINST_REMOTE'):
         yield remove_url  # pragma: no cover
     else:
-        base_url = 'http://localhost:8787'
-        cf_dir = Path(__file__).parent.parent / 'cf-worker'
-        schema_sql = (cf_dir / 'schema.sql').read_text()
-        schema_sql += '\ndelete from namespaces;'
-
-        with tempfile.NamedTemporaryFile() as f:
-            f.write(schema_sql.encode())
-            f.flush()
-            # reset the local database for testing
-            p = subprocess.run(
-                ['npx', 'wrangler', 'd1', 'execute', 'cloudkv-limits', '--local', '--file', f.name],
-                cwd=cf_dir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-            )
-            if p.returncode != 0:  # pragma: no cover
-                raise RuntimeError(f'SQL reset command failed with exit code {p.returncode}:\n{p.stdout.decode()}')
-
-        server_process = subprocess.Popen(
-            ['npm', 'run', 'dev'],
+        with _run_dev_server() as base_url:
+            yield base_url
+
+
+_xdist_server = ExitStack()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # With pytest-xdist (`pytest -n auto`) each worker would start its own dev server, and they'd all fight over the
+    # same port and local database, instead the controller runs one server and workers inherit its URL.
+    if (
+        config.pluginmanager.hasplugin('xdist')
+        and config.getoption('numprocesses')
+        and 'PYTEST_XDIST_WORKER' not in os.environ
+        and 'TEST_AGAINST_REMOTE' not in os.environ
+    ):  # pragma: no cover
+        os.environ['TEST_AGAINST_REMOTE'] = _xdist_server.enter_context(_run_dev_server())
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    _xdist_server.close()
+
+
+@contextmanager
+def _run_dev_server() -> Iterator[str]:
+    base_url = 'http://localhost:8787'
+    cf_dir = Path(__file__).parent.parent / 'cf-worker'
+    schema_sql = (cf_dir / 'schema.sql').read_text()
+    schema_sql += '\ndelete from namespaces;'
+
+    # start the dev server first so it boots while the local database is reset
+    server_process = subprocess.Popen(
+        ['npm', 'run', 'dev'],
+        cwd=cf_dir,
+        # the output is never read, with a pipe wrangler would block once the pipe buffer filled up
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.STDOUT,
+        # run in its own process group so the whole npm -> wrangler -> workerd tree can be stopped together
+        start_new_session=True,
+    )
+    try:
+        # reset the local database for testing, tests can't start until this has finished
+        p = subprocess.run(
+            ['npx', 'wrangler', 'd1', 'execute', 'cloudkv-limits', '--local', '--command', schema_sql],
             cwd=cf_dir,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
         )
+        if p.returncode != 0:  # pragma: no cover
+            raise RuntimeError(f'SQL reset command failed with exit code {p.returncode}:\n{p.stdout.decode()}')
+
+        _check_connection(base_url)
+
+        yield base_url
+
+    finally:
+        # Stop the development server, npm doesn't reliably pass SIGTERM on, so signal the whole process group
+        os.killpg(server_process.pid, signal.SIGTERM)
         try:
-            _check_connection(base_url)
+            server_process.wait(timeout=2)
+        except subprocess.TimeoutExpired:  # pragma: no cover
+            os.killpg(server_process.pid, signal.SIGKILL)
+            server_process.wait()
 
-            yield base_url
 
-        finally:
-            # Stop the development server
-            server_process.terminate()
+@pytest.fixture(scope='session')
+def http_client() -> Iterable[httpx.Client]:
+    """Client shared by all sync tests, so connections are reused between tests."""
+    with _utils.new_sync_client() as client:
+        yield client
 
 
-def _check_connection(base_url: str):  # pragma: no cover
+@pytest.fixture(scope='session')
+async def async_http_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Client shared by all async tests, this also means async tests share a single event loop."""
+    async with _utils.new_async_client() as client:
+        yield client
+
+
+@pytest.fixture(scope='session')
+def namespace(server: str) -> shared.CreateNamespaceDetails:
+    """Namespace shared by tests which don't list keys, used with `key_prefix` to keep tests apart.
+
+    This avoids creating a namespace per test, the server only allows 20 new namespaces per IP per day.
+    """
+    return SyncCloudKV.create_namespace(base_url=server)
+
+
+@pytest.fixture
+def key_prefix() -> str:
+    return f'{uuid.uuid4().hex}_'
+
+
+def _check_connection(base_url: str, timeout: float = 10):  # pragma: no cover
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    # one client for all attempts so we reuse the connection once the server is up
     with httpx.Client(timeout=1) as client:
-        for _ in range(10):
+        while time.monotonic() < deadline:
             try:
                 r = client.get(base_url)
             except httpx.HTTPError:
-                time.sleep(0.1)
+                pass
             else:
                 if r.status_code == 200:
                     break
-
-        r = client.get(base_url)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+        else:
+            r = client.get(base_url)
         r.raise_for_status()
@@ -1,24 +1,70 @@
+import asyncio
+import sys
 from datetime import timedelta
 
+import httpx
 import pytest
 from dirty_equals import HasLen, IsStr, IsStrictDict
 
-from cloudkv import AsyncCloudKV
+from cloudkv import AsyncCloudKV, _utils, shared
 
 from .conftest import IsDatetime, IsNow
 
 pytestmark = pytest.mark.anyio
 
 
-def test_init():
+async def test_init():
     kv = AsyncCloudKV('read', 'write', base_url='https://example.com/')
     assert kv.namespace_read_token == 'read'
     assert kv.namespace_write_token == 'write'
     assert kv.base_url == 'https://example.com'
+    assert not hasattr(kv, '__dict__')
+    assert kv.client is AsyncCloudKV('other', None).client
+    async with kv as kv2:
+        assert kv2 is kv
+        assert kv.client is AsyncCloudKV('other', None).client
+    assert not kv.client.is_closed
 
-    msg = 'HTTP client not initialized - AsyncCloudKV must be used as an async context manager'
-    with pytest.raises(RuntimeError, match=msg):
-        kv.client
+
+async def test_empty_key():
+    kv = AsyncCloudKV('read', 'write', base_url='https://example.com/')
+    with pytest.raises(ValueError, match='Key cannot be empty'):
+        await kv.get('')
+    with pytest.raises(ValueError, match='Key cannot be empty'):
+        async for _ in kv.get_stream(''):
+            pass
+
+
+async def test_invalid_concurrency():
+    kv = AsyncCloudKV('read', 'write', base_url='https://example.com/')
+    with pytest.raises(ValueError, match='concurrency must be at least 1'):
+        await kv.get_many(['a'], concurrency=0)
+    with pytest.raises(ValueError, match='concurrency must be at least 1'):
+        await kv.set_many({'a': 'apple'}, concurrency=0)
+
+
+def test_install_uvloop():
+    import uvloop
+
+    original_policy = asyncio.get_event_loop_policy()
+    try:
+        assert AsyncCloudKV.install_uvloop() is True
+        assert isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy)
+    finally:
+        asyncio.set_event_loop_policy(original_policy)
+
+
+def test_install_uvloop_missing(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, 'uvloop', None)
+    original_policy = asyncio.get_event_loop_policy()
+    assert AsyncCloudKV.install_uvloop() is False
+    assert asyncio.get_event_loop_policy() is original_policy
+
+
+def test_install_aiohttp(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(_utils, '_use_aiohttp', False)
+    assert AsyncCloudKV.install_aiohttp() is True
+    assert _utils._use_aiohttp is True  # pyright: ignore[reportPrivateUsage]
 
 
 async def test_create_namespace(server: str):
@@ -31,15 +77,15 @@ async def test_create_namespace(server: str):
     )
 
 
-async def test_get_set_tokens(server: str):
+async def test_get_set_tokens(server: str, async_http_client: httpx.AsyncClient):
     create_details = await AsyncCloudKV.create_namespace(base_url=server)
 
-    async with create_details.async_client() as kv:
+    async with create_details.async_client(client=async_http_client) as kv:
         url = await kv.set('test_key', 'test_value')
         assert url == f'{server}/{create_details.read_token}/test_key'
-        assert await kv.get('test_key') == b'test_value'
 
-        keys = await kv.keys()
+        value, keys = await asyncio.gather(kv.get('test_key'), kv.keys())
+        assert value == b'test_value'
         assert [k.model_dump() for k in keys] == [
             {
                 'url': f'{server}/{create_details.read_token}/test_key',
@@ -53,44 +99,119 @@ async def test_get_set_tokens(server: str):
 
         await kv.set('list_of_ints', [1, 2, 3])
         assert await kv.get_as('list_of_ints', list[int]) == [1, 2, 3]
-
-
-async def test_delete(server: str):
+        assert await kv.get_as('missing', list[int], default=[42]) == [42]
+        assert await kv.get_content_type('test_key') == (b'test_value', 'text/plain')
+        assert await kv.get_content_type('missing') == (None, None)
+
+
+async def test_get_stream(
+    namespace: shared.CreateNamespaceDetails, key_prefix: str, async_http_client: httpx.AsyncClient
+):
+    async with namespace.async_client(client=async_http_client) as kv:
+        value = b'x' * 100_000
+        await kv.set(f'{key_prefix}test_key', value)
+        chunks = [chunk async for chunk in kv.get_stream(f'{key_prefix}test_key', chunk_size=10_000)]
+        assert len(chunks) == 10
+        assert b''.join(chunks) == value
+
+        assert [chunk async for chunk in kv.get_stream(f'{key_prefix}missing')] == []
+
+
+async def test_get_stream_error(server: str):
+    async with AsyncCloudKV('0' * 24, None, base_url=server) as kv:
+        with pytest.raises(shared.ResponseError, match='Unexpected 404 response: Namespace does not exist'):
+            [chunk async for chunk in kv.get_stream('test_key')]
+
+
+async def test_get_many_set_many(
+    namespace: shared.CreateNamespaceDetails, key_prefix: str, async_http_client: httpx.AsyncClient
+):
+    a, b, c = f'{key_prefix}a', f'{key_prefix}b', f'{key_prefix}c'
+
+    async with namespace.async_client(client=async_http_client) as kv:
+        urls = await kv.set_many({a: 'apple', b: b'banana', c: [1, 2, 3]}, concurrency=2)
+        assert urls == {
+            a: f'{namespace.base_url}/{namespace.read_token}/{a}',
+            b: f'{namespace.base_url}/{namespace.read_token}/{b}',
+            c: f'{namespace.base_url}/{namespace.read_token}/{c}',
+        }
+
+        values = await kv.get_many([a, b, c, f'{key_prefix}missing'], concurrency=2)
+        assert values == {a: b'apple', b: b'banana', c: b'[1,2,3]', f'{key_prefix}missing': None}
+
+
+async def test_external_client(namespace: shared.CreateNamespaceDetails, key_prefix: str):
+    async with httpx.AsyncClient() as client:
+        kv = namespace.async_client(client=client)
+        async with kv:
+            assert kv.client is client
+            await kv.set(f'{key_prefix}foo', 'bar')
+        assert not client.is_closed
+        assert kv.client is client
+        assert await kv.get(f'{key_prefix}foo') == b'bar'
+
+
+def test_trio(server: str):
+    # run with `trio.run()` rather than anyio's trio backend, since anyio's pytest plugin runs trio tests inside the
+    # task running asyncio tests and fixtures
+    import trio
+
+    async def main() -> None:
+        create_details = await AsyncCloudKV.create_namespace(base_url=server)
+        kv = create_details.async_client()
+        async with kv:
+            client = kv.client
+            await kv.set('foo', 'bar')
+            # nested blocks use the same client, which is only closed when the outermost block exits
+            async with kv:
+                assert kv.client is client
+            assert not client.is_closed
+            assert await kv.get('foo') == b'bar'
+        assert client.is_closed
+        msg = 'AsyncCloudKV must be used as an async context manager, or given client=, when not running on asyncio'
+        with pytest.raises(RuntimeError, match=msg):
+            kv.client
+
+    trio.run(main)
+
+
+async def test_delete(server: str, async_http_client: httpx.AsyncClient):
     create_details = await AsyncCloudKV.create_namespace(base_url=server)
 
-    async with create_details.async_client() as kv:
+    async with create_details.async_client(client=async_http_client) as kv:
         await kv.set('test_key', b'test_value')
-        assert await kv.get('test_key') == b'test_value'
-        keys = await kv.keys()
+        value, keys = await asyncio.gather(kv.get('test_key'), kv.keys())
+        assert value == b'test_value'
         assert [k.key for k in keys] == ['test_key']
         assert [k.content_type for k in keys] == [None]
 
         await kv.delete('test_key')
-        assert await kv.get('test_key') is None
-        keys = await kv.keys()
+        value, keys = await asyncio.gather(kv.get('test_key'), kv.keys())
+        assert value is None
         assert [k.key for k in keys] == []
 
 
-async def test_read_only(server: str):
-    create_details = await AsyncCloudKV.create_namespace(base_url=server)
-    async with create_details.async_client() as kv:
-        await kv.set('test_key', 'test_value')
-        assert await kv.get('test_key') == b'test_value'
+async def test_read_only(
+    namespace: shared.CreateNamespaceDetails, key_prefix: str, async_http_client: httpx.AsyncClient
+):
+    async with namespace.async_client(client=async_http_client) as kv:
+        await kv.set(f'{key_prefix}test_key', 'test_value')
+        assert await kv.get(f'{key_prefix}test_key') == b'test_value'
 
-    async with AsyncCloudKV(create_details.read_token, None, base_url=server) as kv_readonly:
-        assert await kv_readonly.get('test_key') == b'test_value'
+    async with AsyncCloudKV(namespace.read_token, None, base_url=namespace.base_url) as kv_readonly:
+        assert await kv_readonly.get(f'{key_prefix}test_key') == b'test_value'
 
         with pytest.raises(RuntimeError, match="Namespace write key not provided, can't set"):
-            await kv_readonly.set('test_key', 'test_value')
+            await kv_readonly.set(f'{key_prefix}test_key', 'test_value')
 
         with pytest.raises(RuntimeError, match="Namespace write key not provided, can't delete"):
-            await kv_readonly.delete('test_key')
+            await kv_readonly.delete(f'{key_prefix}test_key')
 
 
-async def test_expires(server: str):
+async def test_expires(server: str, async_http_client: httpx.AsyncClient):
     create_details = await AsyncCloudKV.create_namespace(base_url=server)
 
-    async with create_details.async_client() as kv:
+    async with create_details.async_client(client=async_http_client) as kv:
         await kv.set('test_key', 'test_value', expires=123)
 
         keys = await kv.keys()
@@ -104,3 +225,11 @@ async def test_expires(server: str):
         assert len(keys) == 1
         key = keys[0]
         assert (key.expiration - key.created_at).total_seconds() == 60
+
+        # no content type, so the only extra header is `Expires`
+        await kv.set('test_key3', b'test_value', expires=120)
+
+        keys = await kv.keys(like='test_key3')
+        assert [k.content_type for k in keys] == [None]
+        key = keys[0]
+        assert (key.expiration - key.created_at).total_seconds() == 120
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+import httpx
 import pytest
 from dirty_equals import HasLen, IsList, IsStr
 
@@ -15,6 +16,29 @@ def test_init():
     assert kv.namespace_read_token == 'read'
     assert kv.namespace_write_token == 'write'
     assert kv.base_url == 'https://example.com'
+    assert not hasattr(kv, '__dict__')
+    assert SyncCloudKV('read', 'write', base_url='https://example.com///').base_url == 'https://example.com'
+    assert kv.client is SyncCloudKV('other', None).client
+    with kv as kv2:
+        assert kv2 is kv
+        assert kv.client is SyncCloudKV('other', None).client
+    assert not kv.client.is_closed
+
+
+def test_empty_key():
+    kv = SyncCloudKV('read', 'write', base_url='https://example.com/')
+    with pytest.raises(ValueError, match='Key cannot be empty'):
+        kv.get('')
+    with pytest.raises(ValueError, match='Key cannot be empty'):
+        list(kv.get_stream(''))
+
+
+def test_invalid_concurrency():
+    kv = SyncCloudKV('read', 'write', base_url='https://example.com/')
+    with pytest.raises(ValueError, match='concurrency must be at least 1'):
+        kv.get_many(['a'], concurrency=0)
+    with pytest.raises(ValueError, match='concurrency must be at least 1'):
+        kv.set_many({'a': 'apple'}, concurrency=0)
 
 
 def test_create_namespace(server: str):
@@ -27,22 +51,77 @@ def test_create_namespace(server: str):
     }
 
 
-def test_get_set(server: str):
-    kv = SyncCloudKV.create_namespace(base_url=server).sync_client()
+def test_get_set(namespace: shared.CreateNamespaceDetails, key_prefix: str, http_client: httpx.Client):
+    kv = namespace.sync_client(client=http_client)
+
+    url = kv.set(f'{key_prefix}test_key', 'test_value')
+    assert url == f'{namespace.base_url}/{namespace.read_token}/{key_prefix}test_key'
+    assert kv.get(f'{key_prefix}test_key') == b'test_value'
+    assert kv.get_content_type(f'{key_prefix}test_key') == (b'test_value', 'text/plain')
+    assert kv.get_content_type(f'{key_prefix}missing') == (None, None)
+
+
+def test_set_buffers(namespace: shared.CreateNamespaceDetails, key_prefix: str, http_client: httpx.Client):
+    kv = namespace.sync_client(client=http_client)
+
+    kv.set(f'{key_prefix}bytearray', bytearray(b'test_value'))
+    kv.set(f'{key_prefix}memoryview', memoryview(b'test_value'))
+    assert kv.get(f'{key_prefix}bytearray') == b'test_value'
+    assert kv.get(f'{key_prefix}memoryview') == b'test_value'
+
+
+def test_get_many_set_many(namespace: shared.CreateNamespaceDetails, key_prefix: str, http_client: httpx.Client):
+    kv = namespace.sync_client(client=http_client)
+    a, b, c = f'{key_prefix}a', f'{key_prefix}b', f'{key_prefix}c'
+
+    urls = kv.set_many({a: 'apple', b: b'banana', c: [1, 2, 3]}, concurrency=2)
+    assert urls == {
+        a: f'{namespace.base_url}/{namespace.read_token}/{a}',
+        b: f'{namespace.base_url}/{namespace.read_token}/{b}',
+        c: f'{namespace.base_url}/{namespace.read_token}/{c}',
+    }
+
+    values = kv.get_many([a, b, c, f'{key_prefix}missing'], concurrency=2)
+    assert values == {a: b'apple', b: b'banana', c: b'[1,2,3]', f'{key_prefix}missing': None}
 
-    url = kv.set('test_key', 'test_value')
-    assert url == f'{server}/{kv.namespace_read_token}/test_key'
-    assert kv.get('test_key') == b'test_value'
 
+def test_external_client(namespace: shared.CreateNamespaceDetails, key_prefix: str):
+    with httpx.Client() as client:
+        with namespace.sync_client(client=client) as kv:
+            assert kv.client is client
+            kv.set(f'{key_prefix}foo', 'bar')
+        assert not client.is_closed
+        assert kv.get(f'{key_prefix}foo') == b'bar'
 
-def test_get_as(server: str):
-    with SyncCloudKV.create_namespace(base_url=server).sync_client() as kv:
-        kv.set('list_of_ints', [1, 2, 3])
-        assert kv.get_as('list_of_ints', list[int]) == [1, 2, 3]
 
+def test_get_as(namespace: shared.CreateNamespaceDetails, key_prefix: str, http_client: httpx.Client):
+    with namespace.sync_client(client=http_client) as kv:
+        kv.set(f'{key_prefix}list_of_ints', [1, 2, 3])
+        assert kv.get_as(f'{key_prefix}list_of_ints', list[int]) == [1, 2, 3]
+        assert kv.get_as(f'{key_prefix}missing', list[int], default=[42]) == [42]
 
-def test_keys(server: str):
-    kv = SyncCloudKV.create_namespace(base_url=server).sync_client()
+
+def test_get_stream(namespace: shared.CreateNamespaceDetails, key_prefix: str, http_client: httpx.Client):
+    kv = namespace.sync_client(client=http_client)
+
+    value = b'x' * 100_000
+    kv.set(f'{key_prefix}test_key', value)
+    chunks = list(kv.get_stream(f'{key_prefix}test_key', chunk_size=10_000))
+    assert len(chunks) == 10
+    assert b''.join(chunks) == value
+
+    assert list(kv.get_stream(f'{key_prefix}missing')) == []
+
+
+def test_get_stream_error(server: str):
+    kv = SyncCloudKV('0' * 24, None, base_url=server)
+
+    with pytest.raises(shared.ResponseError, match='Unexpected 404 response: Namespace does not exist'):
+        list(kv.get_stream('test_key'))
+
+
+def test_keys(server: str, http_client: httpx.Client):
+    kv = SyncCloudKV.create_namespace(base_url=server).sync_client(client=http_client)
 
     kv.set('test_key', 'test_value')
     kv.set('list_of_ints', [1, 2, 3])
@@ -62,8 +141,8 @@ def test_keys(server: str):
     ]
 
 
-def test_delete(server: str):
-    kv = SyncCloudKV.create_namespace(base_url=server).sync_client()
+def test_delete(server: str, http_client: httpx.Client):
+    kv = SyncCloudKV.create_namespace(base_url=server).sync_client(client=http_client)
 
     kv.set('test_key', b'test_value')
     assert kv.get('test_key') == b'test_value'
@@ -78,24 +157,24 @@ def test_delete(server: str):
     assert [k.key for k in kv.keys()] == []
 
 
-def test_read_only(server: str):
-    kv = SyncCloudKV.create_namespace(base_url=server).sync_client()
+def test_read_only(namespace: shared.CreateNamespaceDetails, key_prefix: str, http_client: httpx.Client):
+    kv = namespace.sync_client(client=http_client)
 
-    kv.set('test_key', 'test_value')
-    assert kv.get('test_key') == b'test_value'
+    kv.set(f'{key_prefix}test_key', 'test_value')
+    assert kv.get(f'{key_prefix}test_key') == b'test_value'
 
     kv_readonly = SyncCloudKV(kv.namespace_read_token, None, base_url=kv.base_url)
-    assert kv_readonly.get('test_key') == b'test_value'
+    assert kv_readonly.get(f'{key_prefix}test_key') == b'test_value'
 
     with pytest.raises(RuntimeError, match="Namespace write key not provided, can't set"):
-        kv_readonly.set('test_key', 'test_value')
+        kv_readonly.set(f'{key_prefix}test_key', 'test_value')
 
     with pytest.raises(RuntimeError, match="Namespace write key not provided, can't delete"):
-        kv_readonly.delete('test_key')
+        kv_readonly.delete(f'{key_prefix}test_key')
 
 
-def test_expires(server: str):
-    kv = SyncCloudKV.create_namespace(base_url=server).sync_client()
+def test_expires(server: str, http_client: httpx.Client):
+    kv = SyncCloudKV.create_namespace(base_url=server).sync_client(client=http_client)
     kv.set('test_key', 'test_value', expires=123)
 
     keys = kv.keys()
@@ -111,6 +190,14 @@ def test_expires(server: str):
     key = keys[0]
     assert (key.expiration - key.created_at).total_seconds() == 60
 
+    # no content type, so the only extra header is `Expires`
+    kv.set('test_key3', b'test_value', expires=120)
+
+    keys = kv.keys(like='test_key3')
+    assert [k.content_type for k in keys] == [None]
+    key = keys[0]
+    assert (key.expiration - key.created_at).total_seconds() == 120
+
 
 def test_invalid_tokens(server: str):
     kv = SyncCloudKV('0' * 24, 'bar', base_url=server)
@@ -1,23 +1,49 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import gc
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from enum import Enum, IntEnum
+from typing import Annotated, Any
 
+import httpx
 import pydantic
 import pytest
+from httpx_aiohttp import AiohttpTransport
 from inline_snapshot import snapshot
 
 from cloudkv import _utils as utils
 
 
+class Colour(str, Enum):
+    red = 'red'
+
+
+class IntColour(IntEnum):
+    red = 1
+
+
 @pytest.mark.parametrize(
     'value,expected_data,expected_content_type',
     [
         ('test', snapshot(b'test'), snapshot('text/plain')),
         (b'test', snapshot(b'test'), snapshot(None)),
         (bytearray(b'test'), snapshot(b'test'), snapshot(None)),
+        (memoryview(b'test'), snapshot(b'test'), snapshot(None)),
         ([1, 2, 3], snapshot(b'[1,2,3]'), snapshot('application/json; pydantic')),
         ({'a': 1, 'b': 2}, snapshot(b'{"a":1,"b":2}'), snapshot('application/json; pydantic')),
         ({'a': 1, 'b': 2}, snapshot(b'{"a":1,"b":2}'), snapshot('application/json; pydantic')),
+        (1.5, snapshot(b'1.5'), snapshot('application/json; pydantic')),
+        (float('inf'), snapshot(b'null'), snapshot('application/json; pydantic')),
+        (None, snapshot(b'null'), snapshot('application/json; pydantic')),
+        ((1, 2), snapshot(b'[1,2]'), snapshot('application/json; pydantic')),
+        (Colour.red, snapshot(b'red'), snapshot('text/plain')),
+        (IntColour.red, snapshot(b'1'), snapshot('application/json; pydantic')),
     ],
 )
 def test_encode(value: Any, expected_data: bytes, expected_content_type: str):
@@ -55,6 +81,11 @@ class Model(pydantic.BaseModel):
         (decode_value_kwargs(b'hello', None, bytes), snapshot(b'hello')),
         (decode_value_kwargs(b'hello', None, bytearray), snapshot(bytearray(b'hello'))),
         (decode_value_kwargs(b'123', 'application/json; pydantic', int), snapshot(123)),
+        (decode_value_kwargs(b'123', 'application/json; pydantic', float), snapshot(123.0)),
+        (decode_value_kwargs(b'"123"', 'application/json; pydantic', int), snapshot(123)),
+        (decode_value_kwargs(b'1', 'application/json; pydantic', bool), snapshot(True)),
+        (decode_value_kwargs(b'[1,2]', 'application/json; pydantic', list), snapshot([1, 2])),
+        (decode_value_kwargs(b'[1,2]', None, list, force_validate=True), snapshot([1, 2])),
         (
             decode_value_kwargs(b'{"x":1,"y":[{"a":[["b","c"],1.0]}]}', 'application/json; pydantic', dict[str, Any]),
             snapshot({'x': 1, 'y': [{'a': [['b', 'c'], 1.0]}]}),
@@ -69,12 +100,27 @@ def test_decode_value_kwargs(kwargs: dict[str, Any], expected: Any):
     assert utils.decode_value(**kwargs) == expected
 
 
+def test_cached_type_adapter():
+    assert utils.cached_type_adapter(list[int]) is utils.cached_type_adapter(list[int])
+    assert utils.cached_type_adapter(list[int]) is not utils.cached_type_adapter(list[str])
+    assert utils.decode_value(b'[1,2]', 'application/json; pydantic', list[int], None, False) == [1, 2]
+    assert utils.decode_value(b'["1","2"]', 'application/json; pydantic', list[str], None, False) == ['1', '2']
+
+
+def test_cached_type_adapter_unhashable():
+    unhashable_type: Any = Annotated[int, {'unhashable': 'metadata'}]
+    with pytest.raises(TypeError):
+        hash(unhashable_type)
+    assert utils.cached_type_adapter(unhashable_type).validate_json(b'1') == 1
+
+
 @pytest.mark.parametrize(
     'kwargs',
     [
         (decode_value_kwargs(b'123', None, int)),
         (decode_value_kwargs(b'[1, 2, 3]', None, list[int])),
         (decode_value_kwargs(b'123', None, Model)),
+        (decode_value_kwargs(b'123', None, Annotated[int, {'a': 1}])),  # pyright: ignore[reportArgumentType]
     ],
 )
 def test_decode_value_kwargs_error(kwargs: dict[str, Any]):
@@ -82,6 +128,17 @@ def test_decode_value_kwargs_error(kwargs: dict[str, Any]):
         utils.decode_value(**kwargs)
 
 
+def test_decode_value_invalid_json():
+    with pytest.raises(pydantic.ValidationError, match='Invalid JSON'):
+        utils.decode_value(b'[1,', 'application/json; pydantic', list, None, False)
+
+
+def test_expires_header():
+    assert utils.expires_header(3600) == '3600'
+    assert utils.expires_header(timedelta(minutes=2, microseconds=1)) == '120'
+    assert utils.expires_header(3600) is utils.expires_header(3600)
+
+
 @pytest.mark.parametrize(
     'kwargs,params',
     [
@@ -91,6 +148,8 @@ def test_decode_value_kwargs_error(kwargs: dict[str, Any]):
         ({'starts_with': 'test'}, snapshot({'like': 'test%'})),
         ({'starts_with': 'te%st'}, snapshot({'like': 'te\\%st%'})),
         ({'ends_with': 'test'}, snapshot({'like': '%test'})),
+        ({'ends_with': 'te_st'}, snapshot({'like': '%te\\_st'})),
+        ({'contains': 'a%b_c'}, snapshot({'like': '%a\\%b\\_c%'})),
         ({'contains': 'test'}, snapshot({'like': '%test%'})),
     ],
 )
@@ -101,3 +160,144 @@ def test_keys_query_params(kwargs: dict[str, Any], params: dict[str, str]):
     kwargs.setdefault('like', None)
     kwargs.setdefault('offset', None)
     assert utils.keys_query_params(**kwargs) == params
+
+
+@pytest.mark.anyio
+async def test_new_async_client_aiohttp(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(utils, '_use_aiohttp', False)
+    assert utils.enable_aiohttp() is True
+    async with utils.new_async_client() as client:
+        assert isinstance(client._transport, AiohttpTransport)  # pyright: ignore[reportPrivateUsage]
+
+    session = utils._aiohttp_session()  # pyright: ignore[reportPrivateUsage]
+    assert session.trust_env is True
+    await session.close()
+
+
+def test_enable_aiohttp_missing(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(utils, '_use_aiohttp', False)
+    monkeypatch.setattr(utils, 'AiohttpTransport', None)
+    assert utils.enable_aiohttp() is False
+
+
+@pytest.mark.anyio
+async def test_new_async_client_httpx():
+    async with utils.new_async_client() as client:
+        assert isinstance(client._transport, httpx.AsyncHTTPTransport)  # pyright: ignore[reportPrivateUsage]
+
+
+@pytest.mark.anyio
+async def test_shared_async_client():
+    client = utils.shared_async_client()
+    assert utils.shared_async_client() is client
+    async with utils.new_async_client() as other:
+        assert utils.shared_async_client() is not other
+
+
+@pytest.mark.anyio
+async def test_shared_async_client_reopened():
+    client = utils.shared_async_client()
+    await client.aclose()
+    new_client = utils.shared_async_client()
+    assert new_client is not client
+    # give the old client's closer a chance to run, it mustn't touch the replacement
+    gc.collect()
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert not new_client.is_closed
+    assert utils.shared_async_client() is new_client
+
+    # closing another client's closer leaves the registered client alone
+    other_client = utils.new_async_client()
+    other_closer = utils._close_at_shutdown(other_client)  # pyright: ignore[reportPrivateUsage]
+    await other_closer.asend(None)
+    await other_closer.aclose()
+    assert other_client.is_closed
+    assert utils.shared_async_client() is new_client
+
+
+async def get_shared_client() -> tuple[httpx.AsyncClient, set[asyncio.Task[Any]]]:
+    return utils.shared_async_client(), asyncio.all_tasks()
+
+
+def test_shared_async_client_closed():
+    client, tasks = asyncio.run(get_shared_client())
+    assert client.is_closed
+    # closing the client doesn't rely on a task left running on the loop
+    assert len(tasks) == 1
+    shared_clients = utils._shared_async_clients.values()  # pyright: ignore[reportPrivateUsage]
+    assert all(c is not client for c, _ in shared_clients)
+
+
+def test_shared_async_client_loop_closed():
+    loop = asyncio.new_event_loop()
+    client, _ = loop.run_until_complete(get_shared_client())
+    # closed without `loop.shutdown_asyncgens()`, so the client can't be closed
+    loop.close()
+    assert loop in utils._shared_async_clients  # pyright: ignore[reportPrivateUsage]
+
+    # entries for closed loops are dropped when a client is created for another loop
+    other_client, _ = asyncio.run(get_shared_client())
+    assert other_client is not client
+    assert loop not in utils._shared_async_clients  # pyright: ignore[reportPrivateUsage]
+
+
+def test_shared_sync_client_threads(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(utils, '_shared_sync_client', None)
+    created: list[httpx.Client] = []
+
+    def new_sync_client() -> httpx.Client:
+        # slow enough that every thread would create a client without the lock
+        time.sleep(0.01)
+        client = httpx.Client()
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(utils, 'new_sync_client', new_sync_client)
+    barrier = threading.Barrier(10)
+
+    def get_client(_: int) -> httpx.Client:
+        barrier.wait()
+        return utils.shared_sync_client()
+
+    with ThreadPoolExecutor(10) as pool:
+        clients = list(pool.map(get_client, range(10)))
+    assert len(created) == 1
+    assert all(client is created[0] for client in clients)
+
+    utils._close_shared_sync_client()  # pyright: ignore[reportPrivateUsage]
+    assert created[0].is_closed
+    monkeypatch.setattr(utils, '_shared_sync_client', None)
+    utils._close_shared_sync_client()  # pyright: ignore[reportPrivateUsage]
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork()')
+def test_shared_sync_client_fork():
+    client = utils.shared_sync_client()
+    with warnings.catch_warnings():
+        # forking while other threads are running is deprecated, the child here doesn't rely on them
+        warnings.simplefilter('ignore', DeprecationWarning)
+        pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        # the child mustn't reuse the parent's connections
+        ok = utils._shared_sync_client is None and utils.shared_sync_client() is not client  # pyright: ignore[reportPrivateUsage]
+        os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert utils.shared_sync_client() is client
+
+
+def test_lazy_module_attributes(monkeypatch: pytest.MonkeyPatch):
+    import cloudkv
+
+    # submodules are also available lazily, as they would be without another import having loaded them
+    monkeypatch.delattr(cloudkv, 'shared')
+    assert cloudkv.shared.KeyInfo.__name__ == 'KeyInfo'
+    assert {'__version__', 'SyncCloudKV', 'AsyncCloudKV'} <= set(dir(cloudkv))
+
+    assert cloudkv.SyncCloudKV.__name__ == 'SyncCloudKV'
+    assert cloudkv.AsyncCloudKV.__name__ == 'AsyncCloudKV'
+    assert isinstance(cloudkv.__version__, str)
+    with pytest.raises(AttributeError, match="module 'cloudkv' has no attribute 'missing'"):
+        cloudkv.missing